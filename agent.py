@@ -1,8 +1,19 @@
+import hashlib
 import json
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import orjson
 import streamlit as st
+from diskcache import Cache
 from openai import OpenAI
 
+# A well-formed tool call, capturing its JSON payload
+_TOOL_RE = re.compile(r"<TOOL>\s*(\{.*?\})\s*</TOOL>", re.DOTALL)
+# Any tool block, including malformed or unterminated ones
+_TOOL_BLOCK_RE = re.compile(r"<TOOL>.*?(?:</TOOL>|$)", re.DOTALL)
+
 
 class AgentSystem:
     """Agent system for analyzing PSU data"""
@@ -40,6 +51,10 @@ Available tools:
 - identify_top_performers: Find top PSUs by metric (parameters: sector, metric, top_n)
 - analyze_sector: Analyze a sector's performance (parameters: sector)
 
+get_psu_data and get_sector_data return records in a compact columnar form:
+{"columns": ["PSU_Name", "Sector", ...], "rows": [["PSU_1", "Energy", ...], ...]}
+Each row lists its values in the same order as "columns".
+
 Example of using a tool:
 <TOOL>
 {
@@ -80,6 +95,10 @@ Available tools:
 - identify_top_performers: Find top PSUs by metric (parameters: sector, metric, top_n)
 - analyze_sector: Analyze a sector's performance (parameters: sector)
 
+get_psu_data and get_sector_data return records in a compact columnar form:
+{"columns": ["PSU_Name", "Sector", ...], "rows": [["PSU_1", "Energy", ...], ...]}
+Each row lists its values in the same order as "columns".
+
 Example of using a tool:
 <TOOL>
 {
@@ -90,14 +109,43 @@ Example of using a tool:
 """
     }
 
-    def __init__(self, api_key, tools):
+    def __init__(self, api_key, tools, cache_sampled_responses=False):
+        # Pooled HTTP/2 connections, so TLS handshakes to OpenRouter are
+        # reused across LLM calls
+        self._http = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=20, keepalive_expiry=60),
+            # Long synthesis streams need a generous read timeout, matching
+            # the OpenAI client's 600s default
+            timeout=httpx.Timeout(connect=10.0, read=600.0, write=60.0,
+                                  pool=60.0)
+        )
         self.llm_client = OpenAI(
             base_url="https://openrouter.ai/api/v1",
-            api_key=api_key
+            api_key=api_key,
+            http_client=self._http
         )
         self.tools = tools
         self.model = "openai/gpt-4o-mini"
+        self.temperature = 0.3
         self.max_iterations = 3
+        # Older tool results are summarized once the context grows past this
+        self.max_context_chars = 48000
+
+        # LLM response cache shared across queries and app restarts.
+        # Responses sampled with temperature > 0 are only cached on opt-in,
+        # and the cache is only opened on disk when it can be used.
+        self.cache_sampled_responses = cache_sampled_responses
+        self.llm_cache = None
+        if cache_sampled_responses or self.temperature == 0:
+            self.llm_cache = Cache(
+                "./.llm_cache", eviction_policy="least-recently-used")
+        self.llm_cache_ttl = 24 * 60 * 60
+
+        # Invariant prompt prefix per agent type, built on first use
+        self._dataset_overview = None
+        self._static_prefixes = {}
 
         # Tool mapping for execution
         self.tool_map = {
@@ -114,89 +162,128 @@ Example of using a tool:
         """Process a user query with real-time status updates"""
         # Set up Streamlit placeholders for live updates
         response_container = st.empty()
-        status_log = st.status(f"Processing {agent_type} query...")
+        status_log = st.status(f"Processing {agent_type} query...",
+                               expanded=True)
         status_log.update(
             label=f"Initializing {agent_type} analysis...", state="running")
 
         try:
-            # Initialize conversation context
-            context = [
-                {"role": "system", "content": self.AGENT_PROMPTS[agent_type]},
-                {"role": "user", "content": query}
-            ]
+            # Dataset overview and prompt prefix, built once per agent type
+            dataset_overview, static_prefix = self._get_static_prefix(
+                agent_type)
+
+            # Initialize conversation context. The static prefix comes first
+            # and is identical across iterations and queries so providers can
+            # serve it from their prompt cache.
+            context = static_prefix + [{"role": "user", "content": query}]
 
             # Initialize collected data for global context
             collected_data = {
                 "tools_used": [],
-                "dataset_context": None,
+                "dataset_context": dataset_overview,
                 "entity_data": {}
             }
 
-            # First get dataset overview for global context
-            with status_log.container():
-                st.write("🔎 Getting dataset overview...")
-                dataset_overview = self.tools.get_dataset_overview()
-                collected_data["dataset_context"] = dataset_overview
-                overview_msg = f"""
-                Here's an overview of the dataset:
-                - {dataset_overview['psu_count']} PSUs across {dataset_overview['sector_count']} sectors
-                - Data from {dataset_overview['year_range']}
-                - In the latest year ({dataset_overview['latest_year']}), there are {dataset_overview['profitable_psus']} profitable PSUs and {dataset_overview['loss_making_psus']} loss-making PSUs
-                """
-                context.append({"role": "user", "content": overview_msg})
+            # Tool outcomes for this query as futures, keyed by tool name and
+            # parameters
+            tool_cache = {}
+
+            # Short summaries of full tool results in the context, keyed by
+            # message index, used when older results are pruned
+            tool_summaries = {}
 
             # Track iterations
             iteration = 0
             final_response = None
 
-            # Main processing loop
-            while iteration < self.max_iterations:
-                iteration += 1
-                status_log.update(
-                    label=f"Iteration {iteration}/{self.max_iterations}", state="running")
-
-                with status_log.container():
-                    st.write(f"🧠 Analyzing query and planning response...")
-                    start_time = time.time()
-
-                    # Generate LLM response
-                    response = self.llm_client.chat.completions.create(
-                        model=self.model,
-                        messages=context,
-                        temperature=0.3
-                    )
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                # Main processing loop
+                while iteration < self.max_iterations:
+                    iteration += 1
+                    status_log.update(
+                        label=f"Iteration {iteration}/{self.max_iterations}", state="running")
+
+                    with status_log.container():
+                        st.write(f"🧠 Analyzing query and planning response...")
+                        start_time = time.time()
+
+                        # Stream the LLM response, starting each tool call as
+                        # soon as its closing tag arrives. Turns in this loop
+                        # may be tool-calling preambles, so they are not
+                        # rendered into the answer container while streaming.
+                        new_keys = set()
+                        scan_pos = 0  # end of the last submitted tool block
+                        seen = 0  # buffer length at the previous chunk
+
+                        def on_delta(buffer):
+                            nonlocal scan_pos, seen
+                            # Only text received since the previous chunk can
+                            # complete a new closing tag
+                            end = buffer.rfind(
+                                "</TOOL>", max(scan_pos, seen - len("</TOOL>")))
+                            seen = len(buffer)
+                            if end != -1:
+                                end += len("</TOOL>")
+                                for call in self._parse_tool_calls(buffer[scan_pos:end]):
+                                    if self._submit_tool_call(call, executor, tool_cache):
+                                        new_keys.add(
+                                            self._tool_cache_key(call))
+                                scan_pos = end
+
+                        response_text = self._cached_completion(
+                            context, self.temperature, on_delta)
+                        context.append(
+                            {"role": "assistant", "content": response_text})
 
-                    response_text = response.choices[0].message.content
-                    context.append(
-                        {"role": "assistant", "content": response_text})
-
-                    st.write(
-                        f"✅ Analysis completed in {time.time()-start_time:.1f}s")
-
-                    # Parse tool calls
-                    tool_calls = self._parse_tool_calls(response_text)
+                        st.write(
+                            f"✅ Analysis completed in {time.time()-start_time:.1f}s")
+
+                        # Parse tool calls
+                        tool_calls = self._parse_tool_calls(response_text)
+
+                        # If no more tool calls, we have the final response
+                        if not tool_calls:
+                            final_response = response_text
+                            break
+
+                        # Drop duplicate calls and reuse outcomes already
+                        # computed earlier in this query
+                        requested_keys = []
+                        for call in tool_calls:
+                            key = self._tool_cache_key(call)
+                            if key in requested_keys:
+                                continue
+                            requested_keys.append(key)
+
+                            if key in new_keys:
+                                continue
+                            if self._submit_tool_call(call, executor, tool_cache):
+                                new_keys.add(key)
+                            else:
+                                st.write(
+                                    f"♻️ Cached: {call['tool']} {call['params']}")
 
-                    # If no more tool calls, we have the final response
-                    if not tool_calls:
-                        final_response = response_text
-                        break
+                        # Shrink older tool results before adding this turn's
+                        self._prune_context(context, tool_summaries)
 
-                    # Execute tools
-                    for call in tool_calls:
-                        tool = call["tool"]
-                        params = call["params"]
+                        # Record the results in the order they were requested
+                        # to keep the context stable
+                        for key in requested_keys:
+                            call, result, error_msg, elapsed = tool_cache[key].result()
+                            tool = call["tool"]
+                            params = call["params"]
 
-                        st.write(f"⚙️ Getting data: {tool} {params}")
-                        tool_start = time.time()
+                            if key in new_keys:
+                                st.write(
+                                    f"⏱️ Data retrieved in {elapsed:.1f}s")
 
-                        try:
-                            if tool in self.tool_map:
-                                result = self.tool_map[tool](**params)
+                            if error_msg is None:
                                 # Track used tools and results
+                                result_summary = self._summarize_result(result)
                                 collected_data["tools_used"].append({
                                     "tool": tool,
                                     "params": params,
-                                    "result_summary": self._summarize_result(result)
+                                    "result_summary": result_summary
                                 })
 
                                 # Store data by entity (PSU or sector)
@@ -205,26 +292,20 @@ Example of using a tool:
                                 elif "sector" in params:
                                     collected_data["entity_data"][params["sector"]] = result
 
-                                result_str = json.dumps(result, indent=2)
+                                result_str = orjson.dumps(
+                                    result, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2).decode()
+                                tool_summaries[len(context)] = (
+                                    f"TOOL RESULT ({tool}) {params}: {result_summary}. "
+                                    "Full result omitted to save context, call the tool again if needed.")
                                 context.append({
                                     "role": "user",
                                     "content": f"TOOL RESULT ({tool}): {result_str}"
                                 })
                             else:
-                                error_msg = f"Unknown tool: {tool}"
                                 context.append({
                                     "role": "user",
                                     "content": f"TOOL ERROR: {error_msg}"
                                 })
-                        except Exception as e:
-                            error_msg = f"Tool execution error: {str(e)}"
-                            context.append({
-                                "role": "user",
-                                "content": f"TOOL ERROR: {error_msg}"
-                            })
-
-                        st.write(
-                            f"⏱️ Data retrieved in {time.time()-tool_start:.1f}s")
 
             # If we hit max iterations, get final synthesis
             if final_response is None:
@@ -239,18 +320,15 @@ Example of using a tool:
                 """
                 context.append({"role": "user", "content": synthesis_request})
 
-                # Generate final response
-                response = self.llm_client.chat.completions.create(
-                    model=self.model,
-                    messages=context,
-                    temperature=0.3
-                )
-
-                final_response = response.choices[0].message.content
+                # Generate final response, streaming it into the page
+                final_response = self._cached_completion(
+                    context, self.temperature,
+                    self._throttled_render(response_container))
 
             # Clean and display final response
             clean_response = self._clean_response(final_response)
-            status_log.update(label="Analysis complete", state="complete")
+            status_log.update(label="Analysis complete", state="complete",
+                              expanded=False)
             response_container.markdown(clean_response)
 
             return clean_response
@@ -261,20 +339,147 @@ Example of using a tool:
             st.error(error_msg)
             return error_msg
 
-    def _parse_tool_calls(self, text):
-        """Extract tool calls from LLM response"""
-        tool_calls = []
-        if "<TOOL>" not in text:
-            return []
+    def _get_static_prefix(self, agent_type):
+        """Get the dataset overview and the invariant prompt prefix"""
+        if self._dataset_overview is None:
+            self._dataset_overview = self.tools.get_dataset_overview()
+        dataset_overview = self._dataset_overview
+
+        if agent_type not in self._static_prefixes:
+            overview_msg = f"""
+                Here's an overview of the dataset:
+                - {dataset_overview['psu_count']} PSUs across {dataset_overview['sector_count']} sectors
+                - Data from {dataset_overview['year_range']}
+                - In the latest year ({dataset_overview['latest_year']}), there are {dataset_overview['profitable_psus']} profitable PSUs and {dataset_overview['loss_making_psus']} loss-making PSUs
+                """
+
+            # OpenAI caches long prefixes automatically, Anthropic models
+            # routed through OpenRouter need an explicit cache breakpoint
+            if self.model.startswith("anthropic/"):
+                overview_content = [{
+                    "type": "text",
+                    "text": overview_msg,
+                    "cache_control": {"type": "ephemeral"}
+                }]
+            else:
+                overview_content = overview_msg
+
+            self._static_prefixes[agent_type] = [
+                {"role": "system", "content": self.AGENT_PROMPTS[agent_type]},
+                {"role": "user", "content": overview_content}
+            ]
 
-        tool_blocks = text.split("<TOOL>")[1:]
-        for block in tool_blocks:
-            if "</TOOL>" not in block:
+        return dataset_overview, self._static_prefixes[agent_type]
+
+    def _cached_completion(self, messages, temperature, on_delta=None):
+        """
+        Get the LLM reply for messages, served from the cache on repeats
+
+        The reply is streamed; on_delta, if given, is called with the text
+        received so far after every chunk (once with the full text on a
+        cache hit).
+        """
+        cacheable = self.llm_cache is not None and (
+            temperature == 0 or self.cache_sampled_responses)
+        if cacheable:
+            key = hashlib.sha256(json.dumps(
+                {"m": self.model, "t": temperature, "msgs": messages},
+                sort_keys=True).encode()).hexdigest()
+            cached = self.llm_cache.get(key)
+            if cached is not None:
+                if on_delta:
+                    on_delta(cached)
+                return cached
+
+        stream = self.llm_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True
+        )
+
+        content = ""
+        for chunk in stream:
+            if not chunk.choices:
                 continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                content += delta
+                if on_delta:
+                    on_delta(content)
+
+        if cacheable and content:
+            self.llm_cache.set(key, content, expire=self.llm_cache_ttl)
+        return content
+
+    def _throttled_render(self, container, interval=0.1):
+        """Build an on_delta callback that renders at most every interval seconds"""
+        last_render = 0.0
+
+        def render(buffer):
+            nonlocal last_render
+            now = time.monotonic()
+            if now - last_render >= interval:
+                last_render = now
+                container.markdown(self._clean_response(buffer))
+
+        return render
+
+    def _prune_context(self, context, tool_summaries, keep_last_k=2):
+        """
+        Summarize the oldest full tool results while the context is over budget
+
+        The last keep_last_k results are always kept in full. Rewriting an
+        earlier message changes the prompt prefix from that point on and
+        costs the provider's prompt cache for everything after it, so this
+        only happens once the context is actually too large. Tool results
+        come after the static prefix, which is never touched.
+        """
+        size = sum(len(str(message["content"])) for message in context)
+        indices = sorted(tool_summaries)
+        for index in indices[:max(len(indices) - keep_last_k, 0)]:
+            if size <= self.max_context_chars:
+                break
+            summary = tool_summaries.pop(index)
+            size -= len(context[index]["content"]) - len(summary)
+            context[index] = {"role": "user", "content": summary}
+
+    def _tool_cache_key(self, call):
+        """Build a hashable key identifying a tool call"""
+        return call["tool"], json.dumps(call["params"], sort_keys=True)
+
+    def _submit_tool_call(self, call, executor, tool_cache):
+        """Start a tool call unless it already ran in this query"""
+        key = self._tool_cache_key(call)
+        if key in tool_cache:
+            return False
+
+        st.write(f"⚙️ Getting data: {call['tool']} {call['params']}")
+        tool_cache[key] = executor.submit(self._execute_tool, call)
+        return True
+
+    def _execute_tool(self, call):
+        """Run a single tool call, returning (call, result, error, elapsed)"""
+        tool_start = time.time()
+        result = None
+        error_msg = None
+
+        try:
+            if call["tool"] in self.tool_map:
+                result = self.tool_map[call["tool"]](**call["params"])
+            else:
+                error_msg = f"Unknown tool: {call['tool']}"
+        except Exception as e:
+            error_msg = f"Tool execution error: {str(e)}"
 
+        return call, result, error_msg, time.time() - tool_start
+
+    def _parse_tool_calls(self, text):
+        """Extract tool calls from LLM response"""
+        tool_calls = []
+        for match in _TOOL_RE.finditer(text):
             try:
-                json_str = block.split("</TOOL>")[0].strip()
-                tool_data = json.loads(json_str)
+                tool_data = json.loads(match.group(1))
                 tool_calls.append({
                     "tool": tool_data["tool"],
                     "params": tool_data.get("parameters", {})
@@ -287,17 +492,7 @@ Example of using a tool:
     def _clean_response(self, text):
         """Clean response by removing tool calls and closing statements"""
         # Remove tool calls
-        if "<TOOL>" in text:
-            parts = text.split("<TOOL>")
-            clean_parts = [parts[0]]
-
-            for part in parts[1:]:
-                if "</TOOL>" in part:
-                    after_tool = part.split("</TOOL>", 1)[1]
-                    if after_tool.strip():
-                        clean_parts.append(after_tool)
-
-            text = "".join(clean_parts)
+        text = _TOOL_BLOCK_RE.sub("", text)
 
         # Remove common closing statements
         closings = [
@@ -335,6 +530,8 @@ Example of using a tool:
                 return f"Data for {result['sector']} sector"
             elif "metric" in result:
                 return f"Top performers by {result['metric']}"
+            elif "rows" in result:
+                return f"Retrieved {len(result['rows'])} records"
             else:
                 return "Data retrieved successfully"
         elif isinstance(result, list):
@@ -2,15 +2,25 @@ import os
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import random
 
 
 class DataManager:
     """Handles data generation and loading for PSU analysis"""
 
+    CSV_PATH = "data/psu_data.csv"
+    PARQUET_PATH = "data/psu_data.parquet"
+
+    # Compact dtypes: name columns become integer-coded categoricals
+    DTYPES = {
+        "PSU_Name": "category",
+        "Sector": "category",
+        "Size": "category",
+        "Year": "int16"
+    }
+
     def generate_psu_data(self, num_psus=20, years=5):
         """Generate simplified synthetic financial data for PSUs"""
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
 
         sectors = ["Energy", "Manufacturing",
                    "Mining", "Transportation", "Telecom"]
@@ -18,65 +28,80 @@ class DataManager:
         current_year = datetime.now().year
         years_list = [current_year - i for i in range(years, 0, -1)]
 
-        data = []
-
-        for psu in psu_names:
-            sector = random.choice(sectors)
-            size = random.choice(["Large", "Medium", "Small"])
-
-            # Base financial metrics that will grow/change over years
-            base_revenue = np.random.uniform(1000, 10000) if size == "Large" else \
-                np.random.uniform(500, 2000) if size == "Medium" else \
-                np.random.uniform(100, 500)
-
-            base_profit_margin = np.random.uniform(0.08, 0.20)
-            base_debt_equity = np.random.uniform(0.5, 2.0)
-
-            # Growth/trend factor
-            trend_factor = np.random.uniform(-0.1, 0.15)
-
-            for year in years_list:
-                year_index = years_list.index(year)
-
-                # Generate metrics with some trend and randomness
-                revenue_growth = trend_factor + np.random.uniform(-0.05, 0.05)
-                current_revenue = base_revenue * \
-                    (1 + revenue_growth) ** year_index
-
-                profit_margin = max(min(base_profit_margin + trend_factor *
-                                    year_index/5 + np.random.uniform(-0.02, 0.02), 0.35), -0.2)
-                net_profit = current_revenue * profit_margin
-
-                debt_equity = base_debt_equity + year_index * \
-                    trend_factor/3 + np.random.uniform(-0.1, 0.1)
-
-                # Calculate ROE
-                assets = current_revenue * np.random.uniform(1.5, 3.0)
-                liabilities = assets * np.random.uniform(0.4, 0.7)
-                equity = assets - liabilities
-                roe = net_profit / equity if equity > 0 else 0
-
-                data.append({
-                    "PSU_Name": psu,
-                    "Sector": sector,
-                    "Size": size,
-                    "Year": year,
-                    "Revenue": round(current_revenue, 2),
-                    "Net_Profit": round(net_profit, 2),
-                    "Profit_Margin": round(profit_margin, 4),
-                    "Debt_Equity": round(debt_equity, 2),
-                    "ROE": round(roe, 4),
-                    "Assets": round(assets, 2),
-                    "Liabilities": round(liabilities, 2)
-                })
-
-        return pd.DataFrame(data)
+        # Sample every PSU's attributes and base metrics in bulk
+        psu_sectors = rng.choice(sectors, num_psus)
+        psu_sizes = rng.choice(["Large", "Medium", "Small"], num_psus)
+
+        # Base financial metrics that will grow/change over years
+        base_revenue = np.select(
+            [psu_sizes == "Large", psu_sizes == "Medium"],
+            [rng.uniform(1000, 10000, num_psus),
+             rng.uniform(500, 2000, num_psus)],
+            rng.uniform(100, 500, num_psus))[:, None]
+
+        base_profit_margin = rng.uniform(0.08, 0.20, num_psus)[:, None]
+        base_debt_equity = rng.uniform(0.5, 2.0, num_psus)[:, None]
+
+        # Growth/trend factor
+        trend_factor = rng.uniform(-0.1, 0.15, num_psus)[:, None]
+
+        # Generate metrics with some trend and randomness as a
+        # (num_psus, years) matrix, one row per PSU
+        shape = (num_psus, years)
+        year_index = np.arange(years)
+
+        revenue_growth = trend_factor + rng.uniform(-0.05, 0.05, shape)
+        revenue = base_revenue * (1 + revenue_growth) ** year_index
+
+        profit_margin = np.clip(base_profit_margin + trend_factor * year_index/5 +
+                                rng.uniform(-0.02, 0.02, shape), -0.2, 0.35)
+        net_profit = revenue * profit_margin
+
+        debt_equity = base_debt_equity + year_index * \
+            trend_factor/3 + rng.uniform(-0.1, 0.1, shape)
+
+        # Calculate ROE
+        assets = revenue * rng.uniform(1.5, 3.0, shape)
+        liabilities = assets * rng.uniform(0.4, 0.7, shape)
+        equity = assets - liabilities
+        roe = np.divide(net_profit, equity,
+                        out=np.zeros(shape), where=equity > 0)
+
+        df = pd.DataFrame({
+            "PSU_Name": np.repeat(psu_names, years),
+            "Sector": np.repeat(psu_sectors, years),
+            "Size": np.repeat(psu_sizes, years),
+            "Year": np.tile(years_list, num_psus),
+            "Revenue": revenue.ravel().round(2),
+            "Net_Profit": net_profit.ravel().round(2),
+            "Profit_Margin": profit_margin.ravel().round(4),
+            "Debt_Equity": debt_equity.ravel().round(2),
+            "ROE": roe.ravel().round(4),
+            "Assets": assets.ravel().round(2),
+            "Liabilities": liabilities.ravel().round(2)
+        })
+
+        return df.astype(self.DTYPES)
 
     def load_data(self):
-        """Load or generate PSU data"""
-        try:
-            return pd.read_csv("data/psu_data.csv")
-        except FileNotFoundError:
-            df = self.generate_psu_data()
-            df.to_csv("data/psu_data.csv", index=False)
-            return df
+        """Load PSU data from Parquet, rebuilding it from CSV or generated data"""
+        csv_exists = os.path.exists(self.CSV_PATH)
+        parquet_stale = csv_exists and os.path.exists(self.PARQUET_PATH) and \
+            os.path.getmtime(self.CSV_PATH) > os.path.getmtime(self.PARQUET_PATH)
+
+        df = None
+        if not parquet_stale:
+            try:
+                df = pd.read_parquet(self.PARQUET_PATH)
+            except FileNotFoundError:
+                pass
+
+        if df is None:
+            if csv_exists:
+                df = pd.read_csv(self.CSV_PATH).astype(self.DTYPES)
+            else:
+                df = self.generate_psu_data()
+            df.to_parquet(self.PARQUET_PATH, compression="zstd", index=False)
+
+        # Keep numeric columns in Arrow memory; name columns stay categorical
+        return df.convert_dtypes(dtype_backend="pyarrow")
@@ -11,6 +11,29 @@ from ui import PSUInterface
 load_dotenv()
 
 
+# Heavy objects are cached so they survive Streamlit's script reruns
+@st.cache_resource
+def _load_data():
+    return DataManager().load_data()
+
+
+@st.cache_resource
+def _build_toolkit():
+    return AnalysisToolkit(_load_data())
+
+
+@st.cache_resource
+def _build_agent_system(api_key, cache_sampled_responses):
+    return AgentSystem(api_key, _build_toolkit(),
+                       cache_sampled_responses=cache_sampled_responses)
+
+
+@st.cache_resource
+def _build_interface(api_key, cache_sampled_responses):
+    return PSUInterface(
+        _load_data(), _build_agent_system(api_key, cache_sampled_responses))
+
+
 def main():
     # Set page configuration
     st.set_page_config(page_title="Agentic AI Interface", layout="wide")
@@ -24,16 +47,13 @@ def main():
             st.error("API key is required to continue.")
             st.stop()
 
-    # Initialize data
-    data_manager = DataManager()
-    df = data_manager.load_data()
-
-    # Initialize tools and agent
-    tools = AnalysisToolkit(df)
-    agent_system = AgentSystem(api_key, tools)
+    # Sampled (temperature > 0) answers are only reused from the on-disk
+    # LLM cache when explicitly enabled
+    cache_sampled_responses = os.environ.get(
+        "CACHE_SAMPLED_RESPONSES", "").lower() in ("1", "true", "yes")
 
-    # Initialize UI
-    app = PSUInterface(df, agent_system)
+    # Initialize data, tools, agent and UI
+    app = _build_interface(api_key, cache_sampled_responses)
     app.run()
 
 
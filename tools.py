@@ -9,6 +9,43 @@ class AnalysisToolkit:
     def __init__(self, df):
         self.df = df
 
+        # Precomputed views shared by the tools, so each call skips the
+        # groupby needed to find every PSU's latest record
+        self._latest = self._latest_rows(df)
+        self._latest_by_sector = {
+            sector: group for sector, group in self._latest.groupby('Sector', sort=False, observed=True)}
+        self._sectors = df['Sector'].unique().tolist()
+
+        # Each PSU's history (sorted by year) and each sector's rows, so
+        # lookups are a dict access instead of a mask over the whole frame
+        self._by_psu = {
+            psu: group.sort_values('Year') for psu, group in df.groupby('PSU_Name', sort=False, observed=True)}
+        self._by_sector = {
+            sector: group for sector, group in df.groupby('Sector', sort=False, observed=True)}
+
+        # Sorted latest-year metric values per sector, built on first use
+        self._sorted_by_sector = {}
+
+    @staticmethod
+    def _latest_rows(df):
+        """Get the latest-year row of every PSU in a single hashed pass"""
+        return df.loc[df.groupby('PSU_Name', sort=False, observed=True)['Year'].idxmax()]
+
+    @staticmethod
+    def _to_columnar(df):
+        """Serialize records as column names plus row lists, without a dict per row"""
+        return {"columns": df.columns.tolist(), "rows": df.to_numpy().tolist()}
+
+    def _sorted_sector_metrics(self, sector):
+        """Get a sector's latest-year ranking metrics as sorted arrays"""
+        if sector not in self._sorted_by_sector:
+            sector_data = self._latest_by_sector[sector]
+            self._sorted_by_sector[sector] = {
+                metric: np.sort(sector_data[metric].to_numpy())
+                for metric in ('Revenue', 'Profit_Margin', 'ROE')
+            }
+        return self._sorted_by_sector[sector]
+
     def get_dataset_overview(self):
         """Get a high-level overview of the dataset"""
         # Latest year data
@@ -16,9 +53,9 @@ class AnalysisToolkit:
         latest_data = self.df[self.df['Year'] == latest_year]
 
         # Count PSUs and sectors
-        psu_count = len(self.df['PSU_Name'].unique())
-        sector_count = len(self.df['Sector'].unique())
-        sectors = self.df['Sector'].unique().tolist()
+        psu_count = len(self._by_psu)
+        sector_count = len(self._sectors)
+        sectors = list(self._sectors)
 
         # Year range
         year_min = self.df['Year'].min()
@@ -26,18 +63,18 @@ class AnalysisToolkit:
 
         # Financial summary
         total_revenue = latest_data['Revenue'].sum()
-        profitable_psus = sum(latest_data['Net_Profit'] > 0)
-        loss_making_psus = sum(latest_data['Net_Profit'] <= 0)
+        profitable_psus = (latest_data['Net_Profit'] > 0).sum()
+        loss_making_psus = (latest_data['Net_Profit'] <= 0).sum()
 
         return {
             "psu_count": psu_count,
             "sector_count": sector_count,
             "sectors": sectors,
             "year_range": f"{year_min} to {year_max}",
-            "latest_year": int(latest_year),
-            "total_revenue": float(total_revenue),
-            "profitable_psus": int(profitable_psus),
-            "loss_making_psus": int(loss_making_psus)
+            "latest_year": latest_year,
+            "total_revenue": total_revenue,
+            "profitable_psus": profitable_psus,
+            "loss_making_psus": loss_making_psus
         }
 
     def get_psu_data(self, psu_name=None):
@@ -48,16 +85,16 @@ class AnalysisToolkit:
         - psu_name: Name of the PSU (or "all" for all PSUs)
 
         Returns:
-        - List of financial records or error message
+        - Columnar financial records ({"columns", "rows"}) or error message
         """
         if psu_name and psu_name != "all":
-            if psu_name not in self.df['PSU_Name'].unique():
+            if psu_name not in self._by_psu:
                 return {"error": f"PSU '{psu_name}' not found"}
-            filtered_df = self.df[self.df['PSU_Name'] == psu_name]
+            filtered_df = self._by_psu[psu_name]
         else:
             filtered_df = self.df
 
-        return filtered_df.to_dict(orient='records')
+        return self._to_columnar(filtered_df)
 
     def get_sector_data(self, sector=None):
         """
@@ -67,20 +104,17 @@ class AnalysisToolkit:
         - sector: Name of the sector (or "all" for all sectors)
 
         Returns:
-        - List of financial records or error message
+        - Columnar financial records ({"columns", "rows"}) or error message
         """
         if sector and sector != "all":
-            if sector not in self.df['Sector'].unique():
+            if sector not in self._by_sector:
                 return {"error": f"Sector '{sector}' not found"}
 
             # Get latest year data for each PSU in the sector
-            latest_year_data = self.df.sort_values(
-                'Year').groupby('PSU_Name').tail(1)
-            filtered_df = latest_year_data[latest_year_data['Sector'] == sector]
-            return filtered_df.to_dict(orient='records')
+            filtered_df = self._latest_by_sector[sector]
+            return self._to_columnar(filtered_df)
         else:
-            sectors = self.df['Sector'].unique().tolist()
-            return {"sectors": sectors}
+            return {"sectors": list(self._sectors)}
 
     def analyze_psu(self, psu_name):
         """
@@ -92,11 +126,11 @@ class AnalysisToolkit:
         Returns:
         - Dictionary with financial metrics and trend analysis
         """
-        if psu_name not in self.df['PSU_Name'].unique():
+        if psu_name not in self._by_psu:
             return {"error": f"PSU '{psu_name}' not found"}
 
         # Get PSU data sorted by year
-        psu_data = self.df[self.df['PSU_Name'] == psu_name].sort_values('Year')
+        psu_data = self._by_psu[psu_name]
 
         # Get sector information
         sector = psu_data['Sector'].iloc[0]
@@ -115,20 +149,17 @@ class AnalysisToolkit:
         trends = {}
         if len(psu_data) > 1:
             # Revenue growth
-            first_year_revenue = psu_data['Revenue'].iloc[0]
-            last_year_revenue = psu_data['Revenue'].iloc[-1]
-            revenue_growth = (
-                (last_year_revenue / first_year_revenue) - 1) * 100
+            revenue = yearly_metrics["revenue"]
+            revenue_growth = ((revenue[-1] / revenue[0]) - 1) * 100
 
             # Profit margin change
-            first_year_margin = psu_data['Profit_Margin'].iloc[0]
-            last_year_margin = psu_data['Profit_Margin'].iloc[-1]
-            margin_change = last_year_margin - first_year_margin
+            margin = yearly_metrics["profit_margin"]
+            margin_change = margin[-1] - margin[0]
 
             trends = {
                 "revenue_growth_percent": round(revenue_growth, 2),
                 "profit_margin_change": round(margin_change, 4),
-                "latest_year_profit": round(float(psu_data['Net_Profit'].iloc[-1]), 2),
+                "latest_year_profit": round(yearly_metrics["net_profit"][-1], 2),
                 "trend_direction": "improving" if revenue_growth > 0 and margin_change > 0 else
                 "mixed" if (revenue_growth > 0) != (margin_change > 0) else
                 "declining"
@@ -138,7 +169,7 @@ class AnalysisToolkit:
             "psu_name": psu_name,
             "sector": sector,
             "size": psu_data['Size'].iloc[0],
-            "latest_year": int(psu_data['Year'].iloc[-1]),
+            "latest_year": yearly_metrics["years"][-1],
             "yearly_metrics": yearly_metrics,
             "trends": trends
         }
@@ -153,45 +184,46 @@ class AnalysisToolkit:
         Returns:
         - Dictionary with comparison metrics
         """
-        if psu_name not in self.df['PSU_Name'].unique():
+        if psu_name not in self._by_psu:
             return {"error": f"PSU '{psu_name}' not found"}
 
         # Get PSU data for the latest year
-        psu_latest = self.df[self.df['PSU_Name'] ==
-                             psu_name].sort_values('Year').iloc[-1]
+        psu_latest = self._by_psu[psu_name].iloc[-1]
         sector = psu_latest['Sector']
 
         # Get latest data for the sector
-        latest_year_data = self.df.sort_values(
-            'Year').groupby('PSU_Name').tail(1)
-        sector_data = latest_year_data[latest_year_data['Sector'] == sector]
+        sector_data = self._latest_by_sector[sector]
 
         # Calculate sector averages
         sector_avg = {
-            "revenue": float(sector_data['Revenue'].mean()),
-            "profit_margin": float(sector_data['Profit_Margin'].mean()),
-            "debt_equity": float(sector_data['Debt_Equity'].mean()),
-            "roe": float(sector_data['ROE'].mean())
+            "revenue": sector_data['Revenue'].mean(),
+            "profit_margin": sector_data['Profit_Margin'].mean(),
+            "debt_equity": sector_data['Debt_Equity'].mean(),
+            "roe": sector_data['ROE'].mean()
         }
 
-        # Calculate PSU's percentile in the sector
-        def percentile_rank(series, value):
-            return (series < value).mean() * 100
+        # Calculate PSU's percentile in the sector with binary searches
+        # over the sector's presorted values
+        sorted_metrics = self._sorted_sector_metrics(sector)
+
+        def percentile_rank(metric):
+            values = sorted_metrics[metric]
+            return np.searchsorted(values, psu_latest[metric], side='left') / len(values) * 100
 
         percentiles = {
-            "revenue": float(percentile_rank(sector_data['Revenue'], psu_latest['Revenue'])),
-            "profit_margin": float(percentile_rank(sector_data['Profit_Margin'], psu_latest['Profit_Margin'])),
-            "roe": float(percentile_rank(sector_data['ROE'], psu_latest['ROE']))
+            "revenue": percentile_rank('Revenue'),
+            "profit_margin": percentile_rank('Profit_Margin'),
+            "roe": percentile_rank('ROE')
         }
 
         return {
             "psu_name": psu_name,
             "sector": sector,
             "psu_metrics": {
-                "revenue": float(psu_latest['Revenue']),
-                "profit_margin": float(psu_latest['Profit_Margin']),
-                "debt_equity": float(psu_latest['Debt_Equity']),
-                "roe": float(psu_latest['ROE'])
+                "revenue": psu_latest['Revenue'],
+                "profit_margin": psu_latest['Profit_Margin'],
+                "debt_equity": psu_latest['Debt_Equity'],
+                "roe": psu_latest['ROE']
             },
             "sector_averages": sector_avg,
             "percentile_rankings": percentiles
@@ -214,31 +246,32 @@ class AnalysisToolkit:
         if metric not in valid_metrics:
             return {"error": f"Invalid metric: {metric}. Valid options are: {', '.join(valid_metrics)}"}
 
-        # Get latest year data for each PSU
-        latest_data = self.df.sort_values('Year').groupby('PSU_Name').tail(1)
-
-        # Filter by sector if specified
+        # Filter latest year data for each PSU by sector if specified
         if sector and sector != "all":
-            if sector not in self.df['Sector'].unique():
+            if sector not in self._by_sector:
                 return {"error": f"Sector '{sector}' not found"}
-            filtered_data = latest_data[latest_data['Sector'] == sector]
+            filtered_data = self._latest_by_sector[sector]
         else:
-            filtered_data = latest_data
+            filtered_data = self._latest
 
         # Sort by metric (lower is better for Debt_Equity)
         ascending = True if metric == "Debt_Equity" else False
         sorted_data = filtered_data.sort_values(metric, ascending=ascending)
 
-        # Extract top performers
+        # Extract top performers from whole columns instead of row Series
+        top_data = sorted_data.head(top_n)
         top_performers = []
-        for _, row in sorted_data.head(top_n).iterrows():
+        for psu, psu_sector, value, profit, revenue, size in zip(
+                top_data['PSU_Name'].tolist(), top_data['Sector'].tolist(),
+                top_data[metric].tolist(), top_data['Net_Profit'].tolist(),
+                top_data['Revenue'].tolist(), top_data['Size'].tolist()):
             top_performers.append({
-                "psu_name": row['PSU_Name'],
-                "sector": row['Sector'],
-                "metric_value": float(row[metric]),
-                "profit": float(row['Net_Profit']),
-                "revenue": float(row['Revenue']),
-                "size": row['Size']
+                "psu_name": psu,
+                "sector": psu_sector,
+                "metric_value": value,
+                "profit": profit,
+                "revenue": revenue,
+                "size": size
             })
 
         return {
@@ -257,33 +290,41 @@ class AnalysisToolkit:
         Returns:
         - Dictionary with sector analysis metrics
         """
-        if sector not in self.df['Sector'].unique():
+        if sector not in self._by_sector:
             return {"error": f"Sector '{sector}' not found"}
 
         # Get all PSUs in this sector
-        sector_data = self.df[self.df['Sector'] == sector]
-
-        # Get unique years in descending order
-        years = sorted(sector_data['Year'].unique(), reverse=True)
+        sector_data = self._by_sector[sector]
+
+        # Aggregate all years in a single grouped pass, latest year first
+        yearly = sector_data.assign(
+            profitable=sector_data['Net_Profit'] > 0
+        ).groupby('Year').agg(
+            total_revenue=('Revenue', 'sum'),
+            total_profit=('Net_Profit', 'sum'),
+            avg_profit_margin=('Profit_Margin', 'mean'),
+            avg_roe=('ROE', 'mean'),
+            avg_debt_equity=('Debt_Equity', 'mean'),
+            profitable_psus=('profitable', 'sum'),
+            record_count=('profitable', 'size')
+        ).sort_index(ascending=False)
 
         # Calculate yearly metrics
         yearly_metrics = []
-        for year in years:
-            year_data = sector_data[sector_data['Year'] == year]
-
+        for row in yearly.itertuples():
             yearly_metrics.append({
-                "year": int(year),
-                "total_revenue": float(year_data['Revenue'].sum()),
-                "total_profit": float(year_data['Net_Profit'].sum()),
-                "avg_profit_margin": float(year_data['Profit_Margin'].mean()),
-                "avg_roe": float(year_data['ROE'].mean()),
-                "avg_debt_equity": float(year_data['Debt_Equity'].mean()),
-                "profitable_psus": int(sum(year_data['Net_Profit'] > 0)),
-                "loss_making_psus": int(sum(year_data['Net_Profit'] <= 0))
+                "year": row.Index,
+                "total_revenue": row.total_revenue,
+                "total_profit": row.total_profit,
+                "avg_profit_margin": row.avg_profit_margin,
+                "avg_roe": row.avg_roe,
+                "avg_debt_equity": row.avg_debt_equity,
+                "profitable_psus": row.profitable_psus,
+                "loss_making_psus": row.record_count - row.profitable_psus
             })
 
         # Get latest year data for all PSUs in the sector
-        latest_year = max(years)
+        latest_year = yearly.index[0]
         latest_data = sector_data[sector_data['Year'] == latest_year]
 
         # Find best and worst performers
@@ -296,7 +337,7 @@ class AnalysisToolkit:
             "sector": sector,
             "psu_count": len(sector_data['PSU_Name'].unique()),
             "yearly_metrics": yearly_metrics,
-            "latest_year": int(latest_year),
+            "latest_year": latest_year,
             "best_performer": best_psu,
             "worst_performer": worst_psu
         }
@@ -1,190 +1,278 @@
+import functools
+
+import pandas as pd
 import streamlit as st
 
 
+# Keyed on a precomputed fingerprint of the dataset; the agent system
+# (and the DataFrame behind it) is excluded from hashing
+@st.cache_data(show_spinner=False)
+def _dataset_overview(df_key, _agent_system):
+    return _agent_system.tools.get_dataset_overview()
+
+
+def _category_levels(column):
+    """Sorted distinct values of a column, read from its categorical levels"""
+    if column.dtype != 'category':
+        column = column.astype('category')
+    return column.cat.categories.tolist()
+
+
+@functools.lru_cache(maxsize=256)
+def _placeholder(selected_psu, selected_sector, sector_of_psu):
+    """Query placeholder text; None means no PSU/sector is selected"""
+    base = "Examples:\n- Compare profitability trends between sectors\n- Suggest policy improvements for energy PSUs"
+
+    if selected_psu is not None:
+        return f"E.g., 'Performance trends of {selected_psu}'\n- Financial health assessment\n- {sector_of_psu} sector comparison\n{base}"
+
+    if selected_sector is not None:
+        return f"E.g., 'Growth patterns in {selected_sector} sector'\n- Compare PSUs in this sector\n- Policy recommendations\n{base}"
+
+    return base
+
+
+# Quick-action query builders, keyed on (selected_psu, selected_sector);
+# None means no PSU/sector is selected
+@functools.lru_cache(maxsize=64)
+def _overview_query(selected_psu, selected_sector):
+    """Generate overview query based on context"""
+    if selected_psu is None:
+        return f"Provide comprehensive overview of PSUs{'' if selected_sector is None else f' in {selected_sector} sector'}"
+    return f"Detailed analysis of {selected_psu} including sector context"
+
+
+@functools.lru_cache(maxsize=64)
+def _trend_query(selected_psu, selected_sector):
+    """Generate trend analysis query"""
+    if selected_psu is None:
+        return f"Show 5-year performance trends{'' if selected_sector is None else f' for {selected_sector} sector'}"
+    return f"Analyze performance trends of {selected_psu} over time"
+
+
+@functools.lru_cache(maxsize=64)
+def _sector_comparison_query(selected_psu, selected_sector):
+    """Generate sector comparison query"""
+    return ("Compare performance metrics across sectors" if selected_sector is None
+            else f"Compare PSUs within {selected_sector} sector")
+
+
+@functools.lru_cache(maxsize=64)
+def _financial_health_query(selected_psu, selected_sector):
+    """Generate financial health query"""
+    return f"Analyze financial health indicators for {selected_psu}"
+
+
+@functools.lru_cache(maxsize=64)
+def _top_performers_query(selected_psu, selected_sector):
+    """Generate top performers query"""
+    return f"Identify top performing PSUs{'' if selected_sector is None else f' in {selected_sector} sector'}"
+
+
+def _render_dataset_overview(agent_system, df_key, sector_counts):
+    """Enhanced dataset overview with visual elements"""
+    with st.expander("📁 Dataset Summary", expanded=True):
+        overview = _dataset_overview(df_key, agent_system)
+
+        cols = st.columns(2)
+        with cols[0]:
+            # One table element instead of a separate st.metric per figure
+            metrics = pd.DataFrame({
+                "Metric": ["Total PSUs", "Sectors Represented",
+                           "Year Coverage", "Profitable/Loss Ratio"],
+                "Value": [str(overview["psu_count"]),
+                          str(overview["sector_count"]),
+                          overview["year_range"],
+                          f"{overview['profitable_psus']} / {overview['loss_making_psus']}"]
+            })
+            st.dataframe(metrics, hide_index=True, use_container_width=True)
+
+        with cols[1]:
+            st.markdown("**Sector Distribution**")
+            st.bar_chart(sector_counts)
+
+        st.caption(
+            f"Latest data from {overview['latest_year']} | Total Revenue: ₹{overview['total_revenue']:,.0f}M")
+
+
+def _render_controls(interface):
+    """Render the left control panel"""
+    with st.container(border=True):
+        st.markdown("### 🔍 Analysis Configuration")
+        st.radio(
+            "**Analysis Mode:**",
+            ["Analyst", "Policy"],
+            index=0,
+            key="agent_type",
+            help="Choose between detailed analysis or policy recommendations"
+        )
+
+        st.divider()
+        psu_all = interface._render_psu_selection()
+        interface._render_sector_selector(psu_all)
+        st.divider()
+        interface._render_quick_actions(psu_all)
+
+
+@st.fragment
+def _render_analysis_area(interface):
+    """Render the main analysis area
+
+    Runs as a fragment so query edits don't rerun the controls and overview;
+    the agent's response is rendered inside the fragment.
+    """
+    with st.container(border=True):
+        st.markdown("### 🧠 Analysis Query")
+
+        # Dynamic placeholder based on selection
+        placeholder = interface._get_query_placeholder()
+        query = st.text_area(
+            "Enter your analysis query:",
+            value=st.session_state.query,
+            height=150,
+            placeholder=placeholder,
+            help="Enter natural language questions or analysis requests"
+        )
+
+        st.session_state.query = query
+
+        if st.button("✨ Analyze", type="primary", use_container_width=True):
+            if query:
+                interface._process_query(
+                    query, agent_type=st.session_state.agent_type)
+            else:
+                st.warning("Please enter a query or use quick actions")
+
+
 class PSUInterface:
     """Streamlit interface for PSU analysis with enhanced UX"""
 
     def __init__(self, df, agent_system):
         self.df = df
         self.agent_system = agent_system
-        self.psu_names = sorted(df['PSU_Name'].unique())
-        self.sectors = sorted(df['Sector'].unique())
-        self._prepare_session_state()
+        self.psu_names = _category_levels(df['PSU_Name'])
+        self.sectors = _category_levels(df['Sector'])
+        # None stands for "all" in both selectboxes
+        self._psu_options = (None, *self.psu_names)
+        self._sector_options = (None, *self.sectors)
+        self._psu_to_sector = dict(zip(df['PSU_Name'], df['Sector']))
+        self._sector_counts = df['Sector'].value_counts()
+        # Cheap hashable fingerprint for cache keys, computed once
+        self._df_key = (len(df), int(pd.util.hash_pandas_object(df, index=False).sum()))
 
     def _prepare_session_state(self):
         if 'query' not in st.session_state:
             st.session_state.query = ""
         if 'selected_psu' not in st.session_state:
-            st.session_state.selected_psu = "All PSUs"
+            st.session_state.selected_psu = None
         if 'selected_sector' not in st.session_state:
-            st.session_state.selected_sector = "All Sectors"
+            st.session_state.selected_sector = None
+        if 'detected_sector' not in st.session_state:
+            st.session_state.detected_sector = None
 
     def run(self):
         """Main UI rendering function"""
+        # The interface is shared across sessions; session state is not
+        self._prepare_session_state()
+
         # st.set_page_config(page_title="PSU Analysis System", layout="wide")
         st.title("Ministry of Industries Agentic AI System")
-        st.markdown("---")
+        st.divider()
 
         # Main layout columns
         control_col, analysis_col = st.columns([1, 3], gap="large")
 
         with control_col:
-            self._render_controls()
+            _render_controls(self)
 
         with analysis_col:
-            self._render_analysis_area()
-
-        self._render_dataset_overview()
-
-    def _render_controls(self):
-        """Render the left control panel"""
-        with st.container(border=True):
-            st.markdown("### 🔍 Analysis Configuration")
-            agent_type = st.radio(
-                "**Analysis Mode:**",
-                ["Analyst", "Policy"],
-                index=0,
-                help="Choose between detailed analysis or policy recommendations"
-            )
+            _render_analysis_area(self)
 
-            st.markdown("---")
-            self._render_psu_selection()
-            self._render_sector_selector()
-            st.markdown("---")
-            self._render_quick_actions(agent_type)
+        _render_dataset_overview(self.agent_system, self._df_key,
+                                 self._sector_counts)
 
     def _render_psu_selection(self):
-        """Render PSU selection with dynamic sector detection"""
-        st.session_state.selected_psu = st.selectbox(
+        """Render PSU selection with dynamic sector detection
+
+        Returns True when all PSUs are selected.
+        """
+        st.selectbox(
             "**Select PSU:**",
-            ["All PSUs"] + self.psu_names,
-            index=0,
+            self._psu_options,
+            format_func=lambda x: "All PSUs" if x is None else x,
+            key="selected_psu",
+            on_change=self._reset_sector_filter,
             help="Select specific PSU or analyze all"
         )
 
+        psu_all = st.session_state.selected_psu is None
+
+        # Looked up once here; the analysis area reads it from session state
+        sector = None if psu_all else self._get_psu_sector(st.session_state.selected_psu)
+        st.session_state.detected_sector = sector
+
         # Show detected sector when single PSU is selected
-        if st.session_state.selected_psu != "All PSUs":
-            sector = self._get_psu_sector(st.session_state.selected_psu)
+        if not psu_all:
             st.markdown(f"**Detected Sector:** {sector}")
             st.session_state.selected_sector = sector  # Auto-set sector context
+        return psu_all
 
-    def _render_sector_selector(self):
+    @staticmethod
+    def _reset_sector_filter():
+        """Drop the auto-set sector when going back to all PSUs"""
+        if st.session_state.selected_psu is None:
+            st.session_state.selected_sector = None
+
+    def _render_sector_selector(self, psu_all):
         """Conditionally render sector selector based on PSU selection"""
-        if st.session_state.selected_psu == "All PSUs":
-            st.session_state.selected_sector = st.selectbox(
+        if psu_all:
+            st.selectbox(
                 "**Filter by Sector:**",
-                ["All Sectors"] + self.sectors,
-                index=0,
+                self._sector_options,
+                format_func=lambda x: "All Sectors" if x is None else x,
+                key="selected_sector",
                 help="Filter analysis by specific sector"
             )
 
-    def _render_quick_actions(self, agent_type):
+    def _render_quick_actions(self, psu_all):
         """Render context-aware quick action buttons"""
         st.markdown("### 🚀 Quick Analysis")
 
+        build_query = None
         btn_col1, btn_col2 = st.columns(2)
         with btn_col1:
             if st.button("📊 PSU Overview", use_container_width=True):
-                self._trigger_overview_query(agent_type)
+                build_query = _overview_query
 
         with btn_col2:
             if st.button("📈 Trend Analysis", use_container_width=True):
-                self._trigger_trend_query(agent_type)
+                build_query = _trend_query
 
-        if st.session_state.selected_psu == "All PSUs":
+        if psu_all:
             if st.button("🏭 Sector Comparison", use_container_width=True):
-                self._trigger_sector_comparison(agent_type)
+                build_query = _sector_comparison_query
         else:
             if st.button("📋 Financial Health", use_container_width=True):
-                self._trigger_financial_health_query(agent_type)
+                build_query = _financial_health_query
 
         if st.button("🏆 Top Performers", use_container_width=True):
-            self._trigger_top_performers_query(agent_type)
-
-    def _render_analysis_area(self):
-        """Render the main analysis area"""
-        with st.container(border=True):
-            st.markdown("### 🧠 Analysis Query")
-
-            # Dynamic placeholder based on selection
-            placeholder = self._get_query_placeholder()
-            query = st.text_area(
-                "Enter your analysis query:",
-                value=st.session_state.query,
-                height=150,
-                placeholder=placeholder,
-                help="Enter natural language questions or analysis requests"
-            )
-
-            st.session_state.query = query
+            build_query = _top_performers_query
 
-            if st.button("✨ Analyze", type="primary", use_container_width=True):
-                if query:
-                    self._process_query(query, agent_type="analyst")
-                else:
-                    st.warning("Please enter a query or use quick actions")
+        if build_query is not None:
+            # Only update query text without immediate processing
+            st.session_state.query = build_query(
+                st.session_state.selected_psu, st.session_state.selected_sector)
 
     def _get_query_placeholder(self):
         """Generate contextual query placeholder"""
-        base = "Examples:\n- Compare profitability trends between sectors\n- Suggest policy improvements for energy PSUs"
-
-        if st.session_state.selected_psu != "All PSUs":
-            sector = self._get_psu_sector(st.session_state.selected_psu)
-            return f"E.g., 'Performance trends of {st.session_state.selected_psu}'\n- Financial health assessment\n- {sector} sector comparison\n{base}"
-
-        if st.session_state.selected_sector != "All Sectors":
-            return f"E.g., 'Growth patterns in {st.session_state.selected_sector} sector'\n- Compare PSUs in this sector\n- Policy recommendations\n{base}"
-
-        return base
-
-    def _trigger_overview_query(self, agent_type):
-        """Generate overview query based on context"""
-        if st.session_state.selected_psu == "All PSUs":
-            query = "Provide comprehensive overview of PSUs"
-            if st.session_state.selected_sector != "All Sectors":
-                query += f" in {st.session_state.selected_sector} sector"
-        else:
-            query = f"Detailed analysis of {st.session_state.selected_psu} including sector context"
-        # Only update the query text without processing immediately
-        st.session_state.query = query
-        # Redirect to the right analysis area by just updating session state
-
-    def _trigger_trend_query(self, agent_type):
-        """Generate trend analysis query"""
-        if st.session_state.selected_psu == "All PSUs":
-            query = "Show 5-year performance trends"
-            if st.session_state.selected_sector != "All Sectors":
-                query += f" for {st.session_state.selected_sector} sector"
-        else:
-            query = f"Analyze performance trends of {st.session_state.selected_psu} over time"
-        # Only update query text without immediate processing
-        st.session_state.query = query
-
-    def _trigger_sector_comparison(self, agent_type):
-        """Generate sector comparison query"""
-        query = "Compare performance metrics across sectors"
-        if st.session_state.selected_sector != "All Sectors":
-            query = f"Compare PSUs within {st.session_state.selected_sector} sector"
-        # Only update query text without immediate processing
-        st.session_state.query = query
-
-    def _trigger_financial_health_query(self, agent_type):
-        """Generate financial health query"""
-        query = f"Analyze financial health indicators for {st.session_state.selected_psu}"
-        # Only update query text without immediate processing
-        st.session_state.query = query
-
-    def _trigger_top_performers_query(self, agent_type):
-        """Generate top performers query"""
-        query = "Identify top performing PSUs"
-        if st.session_state.selected_sector != "All Sectors":
-            query += f" in {st.session_state.selected_sector} sector"
-        # Only update query text without immediate processing
-        st.session_state.query = query
+        selected_psu = st.session_state.selected_psu
+        selected_sector = st.session_state.selected_sector
+        return _placeholder(selected_psu, selected_sector,
+                            st.session_state.detected_sector)
 
     def _get_psu_sector(self, psu_name):
         """Get sector for selected PSU"""
-        return self.df[self.df['PSU_Name'] == psu_name]['Sector'].values[0]
+        return self._psu_to_sector[psu_name]
 
     def _set_query_and_process(self, query, agent_type):
         """Set query and trigger processing"""
@@ -201,28 +289,3 @@ class PSUInterface:
         }
 
         self.agent_system.process_query(query, agent_type.lower())
-
-    def _render_dataset_overview(self):
-        """Enhanced dataset overview with visual elements"""
-        with st.expander("📁 Dataset Summary", expanded=True):
-            overview = self.agent_system.tools.get_dataset_overview()
-
-            cols = st.columns([1, 1, 2])
-            with cols[0]:
-                st.metric("Total PSUs", overview["psu_count"])
-                st.metric("Sectors Represented", overview["sector_count"])
-
-            with cols[1]:
-                st.metric("Year Coverage", overview["year_range"])
-                st.metric("Profitable/Loss Ratio",
-                          f"{overview['profitable_psus']} / {overview['loss_making_psus']}")
-
-            with cols[2]:
-                st.markdown("**Sector Distribution**")
-                # Replace sector_distribution with sector_count
-                sector_counts = {s: self.df[self.df['Sector'] == s].shape[0]
-                                 for s in self.df['Sector'].unique()}
-                st.bar_chart(sector_counts)
-
-            st.caption(
-                f"Latest data from {overview['latest_year']} | Total Revenue: ₹{overview['total_revenue']:,.0f}M")